@@ -1,14 +1,29 @@
+import itertools
+import json
 import logging
 import os
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
 from functools import lru_cache
-from multiprocessing import cpu_count
-from multiprocessing.pool import ThreadPool
+from typing import Optional, Tuple
+from urllib.parse import quote
 
 import github
 import requests
+import requests_cache
 from github import Github
 from packageurl import PackageURL
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    # Optional: RE2 guarantees linear-time matching on arbitrary file content
+    import re2 as _re2
+except ImportError:
+    _re2 = re
 
 from disclosurecheck.collectors.securityinsights import analyze_securityinsights
 from disclosurecheck.util.context import Context
@@ -21,55 +36,261 @@ logger = logging.getLogger(__name__)
 
 NUGET_WEBSITE = "https://www.nuget.org"
 
+GITHUB_GRAPHQL_API = "https://api.github.com/graphql"
+
 MAX_PULLS_TO_CHECK = 20
 
-COMMON_SECURITY_MD_PATHS = set(
-    [
-        ".github/security.adoc",
-        ".github/security.markdown",
-        ".github/security.rst",
-        ".github/security.md",
-        ".github/SECURITY.md",
-        "doc/security.rst",
-        "doc/security.md",
-        "docs/security.adoc",
-        "docs/security.markdown",
-        "docs/security.md",
-        "docs/security.rst",
-        "security.adoc",
-        "security.markdown",
-        "security.rst",
-        "security.md",
-        "Security.md",
-        "SECURITY.md"
-    ]
+COMMON_SECURITY_MD_PATHS = (
+    ".github/security.adoc",
+    ".github/security.markdown",
+    ".github/security.rst",
+    ".github/security.md",
+    ".github/SECURITY.md",
+    "doc/security.rst",
+    "doc/security.md",
+    "docs/security.adoc",
+    "docs/security.markdown",
+    "docs/security.md",
+    "docs/security.rst",
+    "security.adoc",
+    "security.markdown",
+    "security.rst",
+    "security.md",
+    "Security.md",
+    "SECURITY.md",
+)
+COMMON_OTHER_FILE_PATHS = ("%name%.gemspec", "Cargo.toml", "LICENSE", "composer.json")
+
+# (filename, priority) for each of the above, split by whether %name% has to be resolved per repository
+_COMMON_FILES = tuple((filename, 10) for filename in COMMON_SECURITY_MD_PATHS) + tuple(
+    (filename, 35) for filename in COMMON_OTHER_FILE_PATHS
 )
-COMMON_OTHER_FILE_PATHS = set(["%name%.gemspec", "Cargo.toml", "LICENSE", "composer.json"])
+_STATIC_FILES = tuple((filename, priority) for filename, priority in _COMMON_FILES if "%name%" not in filename)
+_NAMED_FILES = tuple((filename, priority) for filename, priority in _COMMON_FILES if "%name%" in filename)
 
 MAX_CONTENT_SEARCH_FILES = 30
 
+# Cached file content is revalidated before use, but isn't kept forever
+CONTENT_CACHE_MAX_AGE = timedelta(days=30)
+
+# The thread pool only waits on HTTP requests, so it's sized for concurrent requests, not CPUs
+MAX_IO_WORKERS = 32
+
+# Other files worth searching for an email address, wherever they are in the repository
+_RE_PATH = re.compile(r"(?:^|/)(readme|security)\.(md|rst|txt)$", re.IGNORECASE)
+
+# Matches raw file content, which saves decoding it; only ASCII addresses are matched
+EMAIL_RE_B = _re2.compile(rb"[\w.+\-]+(?:@|\[at\])[\w\-]+\.[\w.\-]+")
+
+# Repositories known to have moved, keyed by their lower-cased (namespace, name)
+_MOVED_REPOSITORIES = {}
+
+# For each exhausted GitHub API rate limit, keyed by (token, resource), the time (in epoch seconds) it resets.
+# GitHub limits each resource (core, graphql, search, ...) separately.
+_rate_limited_until = {}
+
+# Picks the next token in rotation
+_token_counter = itertools.count()
+
+# Created on first use by get_content_session()
+_content_session = None
+_content_session_lock = threading.Lock()
+
+# Shared across calls; threads are only started as the fan-out needs them.
+_IO_POOL = ThreadPoolExecutor(max_workers=MAX_IO_WORKERS, thread_name_prefix="disclosurecheck-io")
+
 
 @lru_cache
-def get_github_token():
-    """Initialize the GitHub token and check to see if we're near our rate limit."""
-    token_value = os.environ.get("GITHUB_TOKEN")
-    if not token_value:
+def get_github_clients() -> tuple:
+    """Initialize the GitHub tokens and a client for each.
+
+    Tokens are read from GITHUB_TOKENS (comma-separated) or GITHUB_TOKEN. Rate limits apply per
+    token, so several tokens multiply the requests available for bulk scanning. The rate limit is
+    not checked up front, since that costs a request; exhaustion is noted when a call fails."""
+    tokens = os.environ.get("GITHUB_TOKENS") or os.environ.get("GITHUB_TOKEN") or ""
+    token_values = [token_value.strip() for token_value in tokens.split(",") if token_value.strip()]
+    if not token_values:
         logger.error("You do not have a GITHUB_TOKEN defined. Functionality will be limited.")
+        return ()
+
+    return tuple((token_value, Github(token_value)) for token_value in token_values)
+
+
+def get_github_token(resource: str = "core") -> Optional[tuple]:
+    """Returns the next (token, client) tuple in rotation, or None if no token is available.
+
+    Tokens known to be rate limited for the given resource are skipped, unless all of them are."""
+    clients = get_github_clients()
+    if not clients:
         return None
 
-    gh = Github(token_value)
-    rate_limit = gh.get_rate_limit()
-    logger.debug(
-        "GitHub Rate Limits: core remaining=%d, search remaining=%d [%s]",
-        rate_limit.core.remaining,
-        rate_limit.search.remaining,
-        rate_limit,
+    now = time.time()
+    for _ in range(len(clients)):
+        client = clients[next(_token_counter) % len(clients)]
+        if _rate_limited_until.get((client[0], resource), 0) <= now:
+            return client
+    return client
+
+
+def _is_rate_limited(resource: str = "core") -> bool:
+    """Checks whether every GitHub token is known to be rate limited for the given resource."""
+    clients = get_github_clients()
+    now = time.time()
+    return bool(clients) and all(
+        _rate_limited_until.get((token_value, resource), 0) > now for token_value, _ in clients
     )
-    if rate_limit.search.remaining == 0 or rate_limit.core.remaining == 0:
-        logger.error("You have exceeded your GitHub API rate limit. Functionality will be limited.")
+
+
+def _get_rate_limit_resource(url: str) -> str:
+    """Returns the GitHub API rate limit resource that a request to the URL counts against."""
+    if url.startswith(GITHUB_GRAPHQL_API):
+        return "graphql"
+    if url.startswith("https://api.github.com/search/"):
+        return "search"
+    return "core"
+
+
+class _GitHubTokenAuth(requests.auth.AuthBase):
+    """Authenticates each request with the next GitHub token in rotation."""
+
+    def __call__(self, r):
+        github_token = get_github_token(_get_rate_limit_resource(r.url))
+        if github_token:
+            r.headers["Authorization"] = f"token {github_token[0]}"
+        return r
+
+
+def _configure_session(session: requests.Session) -> requests.Session:
+    """Sets up a session for GitHub: pooled connections, retries, token rotation and rate limits."""
+    session.mount(
+        "https://",
+        HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=Retry(total=2, backoff_factor=0.3)),
+    )
+    session.hooks["response"].append(_track_rate_limit)
+    session.auth = _GitHubTokenAuth()
+    return session
+
+
+@lru_cache
+def get_session() -> requests.Session:
+    """Returns a shared HTTP session so connections to GitHub are kept alive and reused.
+
+    API responses go stale quickly, so they're only cached for the current run (see main)."""
+    return _configure_session(requests.Session())
+
+
+def get_content_session() -> requests.Session:
+    """Returns a shared HTTP session for file content from raw.githubusercontent.com.
+
+    File content is kept in a persistent cache in the user's cache directory, and always revalidated
+    (If-None-Match / If-Modified-Since) before use, so unchanged files cost a body-less 304. Nothing
+    else is persisted, and entries older than CONTENT_CACHE_MAX_AGE are removed.
+
+    The first call usually comes from the thread pool, so creation is guarded by a lock to open the
+    cache only once."""
+    global _content_session
+    with _content_session_lock:
+        if _content_session is None:
+            session = requests_cache.CachedSession(
+                "disclosurecheck",
+                backend="sqlite",
+                use_cache_dir=True,
+                urls_expire_after={
+                    "raw.githubusercontent.com": requests_cache.EXPIRE_IMMEDIATELY,
+                    "*": requests_cache.DO_NOT_CACHE,
+                },
+            )
+            session.cache.delete(older_than=CONTENT_CACHE_MAX_AGE)
+            _content_session = _configure_session(session)
+        return _content_session
+
+
+def _track_rate_limit(res: requests.Response, *args, **kwargs) -> None:
+    """Response hook that notes when GitHub reports an exhausted API rate limit for a token."""
+    if res.headers.get("X-RateLimit-Remaining") != "0":
+        return
+
+    token_value = res.request.headers.get("Authorization", "").removeprefix("token ")
+    resource = res.headers.get("X-RateLimit-Resource", "core")
+    reset = int(res.headers.get("X-RateLimit-Reset", 0))
+    if reset > _rate_limited_until.get((token_value, resource), 0):
+        _rate_limited_until[(token_value, resource)] = reset
+        logger.error("You have exceeded your GitHub API rate limit (%s). Functionality will be limited.", resource)
+
+
+def _graphql(query: str, variables: dict) -> Optional[dict]:
+    """Executes a query against the GitHub GraphQL API and returns the (possibly partial) data."""
+    res = get_session().post(GITHUB_GRAPHQL_API, json={"query": query, "variables": variables}, timeout=30)
+    if not res.ok:
+        logger.warning("Error loading URL [%s]: %s", GITHUB_GRAPHQL_API, res.status_code)
+        return None
+
+    response = res.json()
+    for error in response.get("errors") or []:
+        logger.debug("GitHub GraphQL error: %s", error.get("message"))
+    return response.get("data")
+
+
+def _build_files_query(filenames: list) -> str:
+    """Builds the GraphQL fields for the given files, aliased as file0, file1, ..."""
+    return "\n".join(
+        f"    file{i}: object(expression: {json.dumps('HEAD:' + filename)}) {{ ... on Blob {{ text }} }}"
+        for i, filename in enumerate(filenames)
+    )
+
+
+def _build_repository_query(filenames: list) -> str:
+    """Builds a single GraphQL query for everything analyze() needs from a repository."""
+    return f"""query($owner: String!, $name: String!) {{
+  repository(owner: $owner, name: $name) {{
+    name
+    isFork
+    isArchived
+    defaultBranchRef {{ name }}
+    owner {{
+      login
+      ... on User {{ email }}
+      ... on Organization {{ email }}
+    }}
+    pullRequests(first: {MAX_PULLS_TO_CHECK}, states: MERGED, orderBy: {{field: UPDATED_AT, direction: DESC}}) {{
+      nodes {{ mergedBy {{ login ... on User {{ email }} }} }}
+    }}
+{_build_files_query(filenames)}
+  }}
+}}"""
+
+
+@lru_cache(maxsize=1024)
+def _get_org_github_repo(org: str) -> Optional[tuple]:
+    """Loads the well-known files from an organization's .github repository.
+
+    This is shared by every repository in the organization, so it's cached. Returns a
+    (default_branch, files) tuple, where files holds (filename, priority, text) for each
+    file that exists, or None if the organization has no .github repository. Raises
+    requests.RequestException if the repository can't be loaded, so a failure isn't cached."""
+    candidates = _STATIC_FILES
+
+    query = f"""query($owner: String!) {{
+  repository(owner: $owner, name: ".github") {{
+    defaultBranchRef {{ name }}
+{_build_files_query([filename for filename, _ in candidates])}
+  }}
+}}"""
+    data = _graphql(query, {"owner": org})
+    if data is None:
+        raise requests.RequestException(f"Unable to load the .github repository of {org}")
+
+    org_data = data.get("repository")
+    if not org_data:
         return None
 
-    return token_value
+    default_branch = (org_data.get("defaultBranchRef") or {}).get("name", "master")
+    files = tuple(
+        (filename, priority, org_data[f"file{i}"]["text"])
+        for i, (filename, priority) in enumerate(candidates)
+        if (org_data.get(f"file{i}") or {}).get("text") is not None
+    )
+    return default_branch, files
 
 
 @lru_cache
@@ -85,52 +306,85 @@ def analyze(purl: PackageURL, context: Context) -> None:
         logger.warning("Unable to analyze GitHub repository without a GITHUB_TOKEN.")
         return
 
-    gh = Github(github_token)
-
     context.related_purls.append(normalize_packageurl(purl))
 
-    try:
-        repo_obj = gh.get_repo(f"{purl.namespace}/{purl.name}")
-    except:
+    if not purl.namespace:
+        logger.warning("Unexpected: GitHub package %s does not have a namespace.", purl)
+        return
+
+    # Don't spend any requests on a repository we already know has moved
+    moved_to = _MOVED_REPOSITORIES.get((purl.namespace.lower(), purl.name.lower()))
+    if moved_to:
+        _add_moved_repository(purl, moved_to[0], moved_to[1], context)
+        return
+
+    # Once the GraphQL rate limit is exhausted, the repository query would fail until it resets
+    if _is_rate_limited("graphql"):
+        logger.warning("Unable to analyze GitHub repository %s until the GitHub API rate limit resets.", purl)
+        return
+
+    # Repository metadata, well-known files and recent pull requests, in a single round trip
+    candidates = _STATIC_FILES + tuple(
+        (filename.replace("%name%", purl.name), priority) for filename, priority in _NAMED_FILES
+    )
+
+    # A single listing of the repository tells us which of those files actually exist. The listing
+    # and other REST calls count against the core rate limit, so they're skipped once it's exhausted.
+    core_rate_limited = _is_rate_limited("core")
+    if core_rate_limited:
+        tree, truncated = None, False
+    else:
+        tree, truncated = _list_repository_tree(purl.namespace, purl.name, "HEAD")
+    if tree is None:
+        repo_candidates = candidates
+    else:
+        present = set(tree)
+        repo_candidates = [(filename, priority) for filename, priority in candidates if filename in present]
+
+    query = _build_repository_query([filename for filename, _ in repo_candidates])
+    data = _graphql(query, {"owner": purl.namespace, "name": purl.name}) or {}
+    repo_data = data.get("repository")
+    if not repo_data:
         logger.warning(f"Unable to access GitHub repository: {purl.namespace}/{purl.name}")
         return
 
+    _org = repo_data["owner"]["login"]
+    _repo = repo_data["name"]
+    if _org.lower() != purl.namespace.lower() or _repo.lower() != purl.name.lower():
+        _MOVED_REPOSITORIES[(purl.namespace.lower(), purl.name.lower())] = (_org, _repo)
+        _add_moved_repository(purl, _org, _repo, context)
+        return
+
+    # The organization's .github repository is loaded alongside, and only once per organization
+    org_future = _IO_POOL.submit(_get_org_github_repo, purl.namespace)
+
     # We probably don't want to report issues to a forked repository.
-    if repo_obj.fork:
+    if repo_data.get("isFork"):
         context.notes.append(f"Repository [bold blue]{purl.namespace}/{purl.name}[/bold blue] is a fork.")
 
-    if repo_obj.archived:
+    if repo_data.get("isArchived"):
         context.notes.append(
             f"Repository [bold blue]{purl.namespace}/{purl.name}[/bold blue] has been archived."
         )
-    default_branch = repo_obj.default_branch
-
-    _org = repo_obj.owner.login
-    _repo = repo_obj.name
-    if _org.lower() != purl.namespace.lower() or _repo.lower() != purl.name.lower():
-        context.notes.append(
-            f"Repository was moved from [bold blue]{purl.namespace}/{purl.name}[/bold blue] to [bold blue]{_org}/{_repo}[/bold blue]."
-        )
-        context.related_purls.append(PackageURL(type="github", namespace=_org, name=_repo))
-        logger.debug(f"Will resume analysis at {_org}/{_repo}.")
-        return
+    default_branch = (repo_data.get("defaultBranchRef") or {}).get("name", "master")
 
     # Check for an email address of the owner (not typical)
-    if repo_obj.owner.email:
+    owner_email = repo_data["owner"].get("email")
+    if owner_email:
         context.add_contact(
             {
                 "priority": 25,
                 "type": "email",
                 "source": f"https://github.com/{_org}",
-                "value": repo_obj.owner.email,
+                "value": owner_email,
             }
         )
-        logger.info("Found email address for repository owner: %s", repo_obj.owner.email)
+        logger.info("Found email address for repository owner: %s", owner_email)
 
     # Check for private vulnerability reporting (REST API)
     url = f"https://api.github.com/repos/{_org}/{_repo}/private-vulnerability-reporting"
-    res = requests.get(url, timeout=30)
-    if res.status_code == 200:
+    res = None if core_rate_limited else get_session().get(url, timeout=30)
+    if res is not None and res.status_code == 200:
         enabled = bool(res.json().get('enabled'))
         if enabled:
             context.add_contact(
@@ -145,7 +399,7 @@ def analyze(purl: PackageURL, context: Context) -> None:
     else:
         # Fall back to web scraping
         url = f"https://github.com/{_org}/{_repo}/security/advisories"
-        res = requests.get(url, timeout=30)
+        res = get_session().get(url, timeout=30)
         if "Report a vulnerability" in res.text:
             context.add_contact(
                 {
@@ -159,76 +413,73 @@ def analyze(purl: PackageURL, context: Context) -> None:
 
     # Check for a contact in a "security.md" in a well-known place (avoid the API call to code search)
     org_purl = PackageURL(type="github", namespace=purl.namespace, name=".github")
+    for i, (filename, priority) in enumerate(repo_candidates):
+        text = (repo_data.get(f"file{i}") or {}).get("text")
+        _check_github_file(purl, filename, text, context, default_branch, priority)
+
     try:
-        org_default_branch = gh.get_repo(f"{org_purl.namespace}/{org_purl.name}").default_branch
-        org_repo_exists = True
-    except:
-        org_default_branch = None
-        org_repo_exists = False
-
-    _args = []
-    for filename in COMMON_SECURITY_MD_PATHS:
-        if "%name%" in filename:
-            filename = filename.replace("%name%", purl.name)
-        _args.append((purl, filename, context, default_branch, 10))
-        if org_repo_exists:
-            _args.append((org_purl, filename, context, org_default_branch, 10))
-    r = ThreadPool(cpu_count() * 2).imap_unordered(_check_github_security_md, _args)
-
-    args = []
-    for filename in COMMON_OTHER_FILE_PATHS:
-        if "%name%" in filename:
-            filename = filename.replace("%name%", purl.name)
-        _args.append((purl, filename, context, default_branch, 35))
-        if org_repo_exists:
-            _args.append((org_purl, filename, context, org_default_branch, 35))
-    r = ThreadPool(cpu_count() * 2).imap_unordered(_check_github_security_md, _args)
+        org_repo = org_future.result()
+    except requests.RequestException as msg:
+        logger.warning("Unable to load the .github repository of %s: %s", purl.namespace, msg)
+        org_repo = None
+    if org_repo:
+        org_default_branch, org_files = org_repo
+        for filename, priority, text in org_files:
+            _check_github_file(org_purl, filename, text, context, org_default_branch, priority)
 
     # See if the repo supports Security Insights
     analyze_securityinsights(purl, context)
 
-    # Try searching for security.md files and related
-    logger.debug("Executing GitHub code search to find SECURITY.md or similar files.")
-    files = gh.search_code(f"repo:{_org}/{_repo} path:/(^|\\/)(readme|security)\\.(md|rst|txt)?$/")
-
-    logger.debug("Found %d files", files.totalCount)
-
-    num_files_left = MAX_CONTENT_SEARCH_FILES
-    for file in files:
-        num_files_left -= 1
-        if num_files_left == 0:
-            break
-        logger.debug("Searching content of [%s]", file.name)
-        content = file.decoded_content.decode("utf-8")
-        matches = set(re.findall(r"[\w.+-]+(@|\[at\])[\w-]+\.[\w.-]+", content))
-        for match in matches:
+    # Look for other security.md files and related, anywhere in the repository
+    if truncated and not _is_rate_limited("core"):
+        # The repository is too large to list in full, but the top of it is the likeliest place
+        logger.debug("Searching only the top-level files of %s/%s.", _org, _repo)
+        tree, _ = _list_repository_tree(_org, _repo, "HEAD", recursive=False)
+    if tree is None:
+        logger.debug("Unable to list the files of %s/%s, skipping the content search.", _org, _repo)
+
+    checked = set(filename for filename, _ in candidates)
+    paths = [
+        path
+        for path in tree or []
+        if _RE_PATH.search(path) and path not in checked
+    ][:MAX_CONTENT_SEARCH_FILES]
+    logger.debug("Found %d files", len(paths))
+
+    # Each file's content is a separate request, so start them all and search each as it arrives
+    urls = [f"https://raw.githubusercontent.com/{_org}/{_repo}/{default_branch}/{quote(path)}" for path in paths]
+    futures = {_IO_POOL.submit(_load_content, url): url for url in urls}
+    for future in as_completed(futures):
+        url = futures[future]
+        try:
+            content = future.result()
+        except requests.RequestException as msg:
+            logger.warning("Error loading URL [%s]: %s", url, msg)
+            continue
+
+        logger.debug("Searching content of [%s]", url)
+        seen = set()
+        for match in EMAIL_RE_B.finditer(content):
+            email = match.group(0).decode("ascii", "replace")
+            if email in seen:
+                continue
+            seen.add(email)
             context.add_contact(
                 {
                     "priority": 25,
                     "type": "email",
-                    "source": file.url,
-                    "value": match,
+                    "source": url,
+                    "value": email,
                 }
             )
-    if num_files_left == MAX_CONTENT_SEARCH_FILES:
-        logger.debug("No results found in GitHub code search.")
 
     # Check for recent pull requests
-    merged_by_people = set()
-    pulls_checked = 0
-    pulls = repo_obj.get_pulls(state="closed", sort="updated", direction="desc")
-    for pull in pulls:
-        if pulls_checked > MAX_PULLS_TO_CHECK:
-            break
-        pulls_checked += 1
-
-        if pull.merged_by is not None:
-            login = pull.merged_by.login
-            if login not in merged_by_people:
-                merged_by_people.add(login)
-
-    for login in merged_by_people:
-        email = gh.get_user(login).email
+    merged_by_people = {}
+    for pull in repo_data["pullRequests"]["nodes"]:
+        if pull.get("mergedBy"):
+            merged_by_people[pull["mergedBy"]["login"]] = pull["mergedBy"].get("email")
+
+    for login, email in merged_by_people.items():
         if email:
             context.add_contact(
                 {
@@ -241,19 +492,63 @@ def analyze(purl: PackageURL, context: Context) -> None:
             )
 
 
-def _check_github_security_md(args):
-    """Checks a "SECURITY.md" file for a security contact.
-    Called by thread pool, not intended for external usage, use check_github_security_md() instead."""
-    if not args:
-        return None
+def _add_moved_repository(purl: PackageURL, org: str, repo: str, context: Context) -> None:
+    """Records that a repository has moved, so that analysis resumes at the new location."""
+    context.notes.append(
+        f"Repository was moved from [bold blue]{purl.namespace}/{purl.name}[/bold blue] to [bold blue]{org}/{repo}[/bold blue]."
+    )
+    context.related_purls.append(PackageURL(type="github", namespace=org, name=repo))
+    logger.debug(f"Will resume analysis at {org}/{repo}.")
+
+
+def _list_repository_tree(
+    org: str, repo: str, ref: str, recursive: bool = True
+) -> Tuple[Optional[list], bool]:
+    """Lists the path of every file in a repository, using a single request to the Git trees API.
+
+    Without recursive, only the files at the top of the repository are listed. Returns a
+    (paths, truncated) tuple, where paths is None if the listing is unavailable or incomplete,
+    and truncated tells whether that's because the repository is too large to list."""
+    url = f"https://api.github.com/repos/{org}/{repo}/git/trees/{ref}"
+    if recursive:
+        url += "?recursive=1"
+    res = get_session().get(url, timeout=30)
+    if res.status_code in (404, 409):
+        # A missing repository is reported by analyze(), and an empty one has no tree
+        logger.debug("Repository tree for %s/%s is not available: %s", org, repo, res.status_code)
+        return None, False
+    if not res.ok:
+        logger.warning("Error loading URL [%s]: %s", url, res.status_code)
+        return None, False
 
-    purl = args[0]
-    filename = args[1]
-    context = args[2]
-    default_branch = args[3] if len(args) > 3 else "master"
-    priority = args[4] if len(args) > 4 else 25
+    data = res.json()
+    if data.get("truncated"):
+        logger.debug("Repository tree for %s/%s is too large to list.", org, repo)
+        return None, True
 
-    return check_github_security_md(purl, filename, context, default_branch, priority)
+    return [entry["path"] for entry in data.get("tree", []) if entry.get("type") == "blob"], False
+
+
+def _load_content(url: str) -> bytes:
+    """Loads the raw content of a file, or an empty string if it can't be loaded."""
+    res = get_content_session().get(url, timeout=30)
+    if not res.ok:
+        logger.warning("Error loading URL [%s]: %s", url, res.status_code)
+        return b""
+
+    return res.content
+
+
+def _check_github_file(
+    purl: PackageURL, filename: str, text: str, context: Context, default_branch="master", priority=25
+):
+    """Checks the content of a file loaded through the GraphQL API for a security contact."""
+    if text is None:
+        logger.debug("GitHub [%s] not found: %s", filename, purl)
+        return
+
+    url = f"https://raw.githubusercontent.com/{purl.namespace}/{purl.name}/{default_branch}/{filename}"
+    find_contacts(url, text, context, priority)
 
 
 def check_github_security_md(
@@ -274,7 +569,7 @@ def check_github_security_md(
         return
 
     url = f"https://raw.githubusercontent.com/{purl.namespace}/{purl.name}/{default_branch}/{filename}"
-    res = requests.get(url, timeout=30)
+    res = get_content_session().get(url, timeout=30)
     if res.ok:
         find_contacts(url, res.text, context, priority)
     else:
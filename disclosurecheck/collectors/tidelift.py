@@ -3,7 +3,7 @@ import re
 from functools import lru_cache
 
 import requests
-from github import Github, UnknownObjectException
+from github import RateLimitExceededException, UnknownObjectException
 from packageurl import PackageURL
 
 from disclosurecheck.util.context import Context
@@ -56,19 +56,26 @@ def analyze_tidelift(purl: PackageURL, context: Context):
             logger.warning("Unable to search GitHub for a Tidelift subscription without a GITHUB_TOKEN")
             return
 
-        gh = Github(github_token)
+        gh = github_token[1]
         # Handle renames, since code search 422s out
         try:
             repo_obj = gh.get_repo(f"{purl.namespace}/{purl.name}")
         except UnknownObjectException:
             logger.warning("Unable to find repository [%s]", purl)
             return
+        except RateLimitExceededException:
+            logger.warning("Unable to search GitHub for a Tidelift subscription: rate limit exceeded.")
+            return
 
         query = f"repo:{repo_obj.owner.login}/{repo_obj.name} tidelift.com"
         logger.debug("Searching for [%s]", query)
         files = gh.search_code(query)
 
-        logger.debug("Found %d results", files.totalCount)
+        try:
+            logger.debug("Found %d results", files.totalCount)
+        except RateLimitExceededException:
+            logger.warning("Unable to search GitHub for a Tidelift subscription: rate limit exceeded.")
+            return
         if files.totalCount:
             tidelift_files = []
             for f in files:
@@ -0,0 +1,20 @@
+import unittest
+from disclosurecheck.collectors.github import EMAIL_RE_B
+
+class TestGithubEmailRegex(unittest.TestCase):
+    EXPECTED_RESULTS = [
+        (b'', []),
+        (b'no contacts here', []),
+        (b'security@example.com', [b'security@example.com']),
+        (b'Email security@example.com to report.', [b'security@example.com']),
+        (b'security[at]example.com', [b'security[at]example.com']),
+        (b'first.last+tag@mail.example.co.uk', [b'first.last+tag@mail.example.co.uk']),
+        (b'a@example.com, b@example.org', [b'a@example.com', b'b@example.org']),
+    ]
+
+    def test(self):
+        for result in self.EXPECTED_RESULTS:
+            self.assertEqual(EMAIL_RE_B.findall(result[0]), result[1], result)
+
+if __name__ == '__main__':
+    unittest.main()
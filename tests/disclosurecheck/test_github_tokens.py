@@ -0,0 +1,117 @@
+import itertools
+import time
+import unittest
+from unittest import mock
+
+import requests
+
+from disclosurecheck.collectors import github
+
+
+class TestGithubTokens(unittest.TestCase):
+    EXPECTED_TOKENS = [
+        ({}, []),
+        ({"GITHUB_TOKEN": "t1"}, ["t1"]),
+        ({"GITHUB_TOKENS": "t1,t2"}, ["t1", "t2"]),
+        ({"GITHUB_TOKENS": " t1, t2,,t3 "}, ["t1", "t2", "t3"]),
+        ({"GITHUB_TOKENS": " , "}, []),
+        ({"GITHUB_TOKENS": "", "GITHUB_TOKEN": "t1"}, ["t1"]),
+        ({"GITHUB_TOKENS": "t1,t2", "GITHUB_TOKEN": "t3"}, ["t1", "t2"]),
+    ]
+
+    def setUp(self):
+        github.get_github_clients.cache_clear()
+        github._token_counter = itertools.count()
+        github._rate_limited_until.clear()
+
+    def tearDown(self):
+        github.get_github_clients.cache_clear()
+        github._rate_limited_until.clear()
+
+    def use_tokens(self, environ):
+        patcher = mock.patch.dict("os.environ", environ, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        github.get_github_clients.cache_clear()
+
+    def next_tokens(self, count, resource="core"):
+        return [github.get_github_token(resource)[0] for _ in range(count)]
+
+    def test_parsing(self):
+        for result in self.EXPECTED_TOKENS:
+            self.use_tokens(result[0])
+            tokens = [token_value for token_value, _ in github.get_github_clients()]
+            self.assertEqual(tokens, result[1], result)
+
+    def test_no_tokens(self):
+        self.use_tokens({})
+        self.assertIsNone(github.get_github_token())
+        self.assertFalse(github._is_rate_limited())
+
+    def test_round_robin(self):
+        self.use_tokens({"GITHUB_TOKENS": "t1,t2,t3"})
+        self.assertEqual(self.next_tokens(6), ["t1", "t2", "t3", "t1", "t2", "t3"])
+
+    def test_skips_rate_limited(self):
+        self.use_tokens({"GITHUB_TOKENS": "t1,t2,t3"})
+        github._rate_limited_until[("t2", "core")] = time.time() + 60
+        self.assertEqual(self.next_tokens(4), ["t1", "t3", "t1", "t3"])
+        self.assertFalse(github._is_rate_limited())
+
+    def test_rate_limit_per_resource(self):
+        self.use_tokens({"GITHUB_TOKENS": "t1,t2"})
+        github._rate_limited_until[("t1", "graphql")] = time.time() + 60
+        self.assertEqual(self.next_tokens(2, "graphql"), ["t2", "t2"])
+        self.assertEqual(self.next_tokens(2), ["t1", "t2"])
+
+    def test_rate_limit_reset(self):
+        self.use_tokens({"GITHUB_TOKENS": "t1,t2"})
+        github._rate_limited_until[("t1", "core")] = time.time() - 1
+        self.assertEqual(self.next_tokens(2), ["t1", "t2"])
+        self.assertFalse(github._is_rate_limited())
+
+    def test_all_rate_limited(self):
+        self.use_tokens({"GITHUB_TOKENS": "t1,t2"})
+        for token_value in ("t1", "t2"):
+            github._rate_limited_until[(token_value, "graphql")] = time.time() + 60
+        self.assertTrue(github._is_rate_limited("graphql"))
+        self.assertFalse(github._is_rate_limited("core"))
+        # A token is still returned, so callers can report the rate limit themselves
+        self.assertIn(github.get_github_token("graphql")[0], ("t1", "t2"))
+
+    def track_response(self, token_value, headers):
+        res = requests.Response()
+        res.headers.update(headers)
+        res.request = requests.Request(
+            "GET", "https://api.github.com/", headers={"Authorization": f"token {token_value}"}
+        ).prepare()
+        github._track_rate_limit(res)
+
+    def test_track_rate_limit(self):
+        reset = int(time.time()) + 60
+        self.track_response("t1", {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(reset),
+                                   "X-RateLimit-Resource": "search"})
+        self.assertEqual(github._rate_limited_until, {("t1", "search"): reset})
+
+    def test_track_rate_limit_default_resource(self):
+        reset = int(time.time()) + 60
+        self.track_response("t1", {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(reset)})
+        self.assertEqual(github._rate_limited_until, {("t1", "core"): reset})
+
+    def test_track_rate_limit_remaining(self):
+        for remaining in ("1", "4999", None):
+            headers = {"X-RateLimit-Reset": str(int(time.time()) + 60), "X-RateLimit-Resource": "core"}
+            if remaining is not None:
+                headers["X-RateLimit-Remaining"] = remaining
+            self.track_response("t1", headers)
+        self.assertEqual(github._rate_limited_until, {})
+
+    def test_track_rate_limit_keeps_latest_reset(self):
+        reset = int(time.time()) + 60
+        for value in (reset, reset - 30):
+            self.track_response("t1", {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(value),
+                                       "X-RateLimit-Resource": "graphql"})
+        self.assertEqual(github._rate_limited_until, {("t1", "graphql"): reset})
+
+if __name__ == '__main__':
+    unittest.main()